@@ -1,36 +1,263 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import copy
 import numpy as np
 from datetime import datetime
 import schedule
 import folium
 import webbrowser
 import os
+import glob
+import shutil
+from collections import deque
+from functools import lru_cache
+import mmap
+import gzip
 from folium import plugins
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import atexit
+from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # optional faster JSON parser for the SWPC response
+except ImportError:
+    orjson = None
+
+# Southernmost latitude (°N) where aurora is visible, indexed by whole Kp level 0-9
+_KP_TO_LATITUDE = (80, 75, 70, 65, 60, 55, 50, 45, 40, 35)
+
+# Longitude samples for the aurora line; a finer step only changes this array
+_LINE_LONGITUDES = np.arange(-180, 181, 5)
+
+# Latitude reference lines never depend on Kp, so build their segments once
+_REFERENCE_LATITUDES = (30, 40, 50, 60, 70)
+_REFERENCE_LINES = [[[lat, -180], [lat, 180]] for lat in _REFERENCE_LATITUDES]
+
+# The newest map is always written to one file; older maps are kept as hourly archive copies
+_LATEST_MAP_FILE = 'aurora_forecast_latest.html'
+_ARCHIVE_MAP_PATTERN = 'aurora_forecast_????????_??.html'
+
+
+def _latitude_band(latitude, longitudes):
+    """Return [lat, lon] pairs along a line of constant latitude as an (n, 2) array"""
+    return np.column_stack([np.full(longitudes.shape, latitude), longitudes])
+
+
+@lru_cache(maxsize=16)
+def _format_timestamp(timestamp_str):
+    """Convert API timestamp to human-readable format (cached: the Kp timestamp only changes every few hours)"""
+    if timestamp_str is None or timestamp_str == "Unknown":
+        return "Unknown"
+        
+    if len(timestamp_str) < 16:
+        print(f"Error formatting timestamp: unexpected format {timestamp_str!r}")
+        return timestamp_str
+
+    try:
+        # Slice the fixed API format ("2024-01-15 12:00:00") directly rather than using strptime
+        dt = datetime(
+            int(timestamp_str[0:4]), int(timestamp_str[5:7]), int(timestamp_str[8:10]),
+            int(timestamp_str[11:13]), int(timestamp_str[14:16])
+        )
+        return dt.strftime("%Y-%m-%d %I:%M %p UTC")
+    except Exception as e:
+        print(f"Error formatting timestamp: {e}")
+        return timestamp_str  # Return original if fail to parse
+
+
+# Shared HTTP session: keeps the SWPC connection alive between requests and retries transient errors
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=2,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+))
 
 class AuroraSystem:
+    __slots__ = (
+        'user_lat', 'user_lon', 'kp_threshold', 'last_alert_time', 'alert_cooldown',
+        'email_config', '_from', '_to', '_pwd', '_smtp_host', '_smtp_port',
+        'kp_cache_ttl', '_kp_cache', 'map_cache_ttl', '_map_cache', '_base_map',
+        '_out_dir', 'map_archive_size', '_map_archive', '_smtp_conn'
+    )
+
+    # Email body templates, filled in with str.format by the send_* methods
+    _DAILY_VISIBLE = """
+DAILY AURORA REPORT 🌌
+
+Your daily aurora conditions update for East Peoria, Illinois:
+
+Current Conditions (as of {current_time}):
+- Kp Index: {kp:.1f}
+- {visibility_info}
+- Your Location: {lat:.2f}°N, {lon:.2f}°W
+- Data From: {data_time}
+
+Aurora Status for Your Location:
+- VISIBLE - Aurora may be visible tonight!
+
+AURORA HUNTING TONIGHT:
+- 1. Check the attached map for current conditions.
+- 2. Look for dark skies away from city lights.
+- 3. Best viewing time: 10 PM - 2 AM.
+- 4. Look north for green glow or dancing lights.
+- 5. Be patient - aurora can appear and disappear quickly.
+
+Weather Reminder:
+- Check local weather for clear skies.
+- Aurora is best viewed on dark, clear nights.
+- Light pollution reduces visibility.
+
+The attached map shows the current aurora forecast and your location.
+
+Happy aurora hunting tonight!
+
+---
+Daily Aurora Report from your Aurora Monitoring System
+Next report: Tomorrow at 12:00 PM CST
+"""
+
+    _DAILY_HIDDEN = """
+DAILY AURORA REPORT 🌌
+
+Your daily aurora conditions update for East Peoria, Illinois:
+
+Current Conditions (as of {current_time}):
+- Kp Index: {kp:.1f}
+- {visibility_info}
+- Your Location: {lat:.2f}°N, {lon:.2f}°W
+- Data From: {data_time}
+
+Aurora Status for Your Location:
+- NOT VISIBLE - Aurora not expected to be visible
+
+MONITORING STATUS:
+- 1. Check attached map for current conditions.
+- 2. Aurora threshold for your location: Kp ≥ 4.
+- 3. You'll receive alerts when conditions improve.
+- 4. Keep monitoring for geomagnetic storms.
+
+Weather Reminder:
+- Check local weather for clear skies.
+- Aurora is best viewed on dark, clear nights.
+- Light pollution reduces visibility.
+
+The attached map shows the current aurora forecast and your location.
+
+Keep watching the skies!
+
+---
+Daily Aurora Report from your Aurora Monitoring System
+Next report: Tomorrow at 12:00 PM CST
+"""
+
+    _STARTUP_BODY = """
+AURORA MONITORING SYSTEM STARTED
+
+The Aurora Monitoring System is now active and watching the skies!
+
+System Details:
+- Started: {startup_time}
+- Monitoring Location: East Peoria, Illinois
+- Coordinates: {lat:.2f}°N, {lon:.2f}°W
+- Alert Threshold: Kp ≥ {kp_threshold}
+- Email Alerts: ENABLED
+
+What happens next:
+- System checks aurora conditions every 30 minutes.
+- Daily reports sent at 12:00 PM CST.
+
+Aurora Alert Conditions:
+- Kp Index must be ≥ {kp_threshold}.
+- Aurora must be visible from your latitude ({lat:.1f}°N).
+- Cooldown period: 1 hour between alerts.
+
+System Status: 🟢 ACTIVE AND MONITORING
+
+This email confirms your Aurora Monitoring System is working correctly and ready to alert you when the northern lights are visible!
+
+
+---
+Aurora Monitoring System Startup Confirmation
+System will continue monitoring until stopped.
+"""
+
+    _ALERT_BODY = """
+AURORA ALERT! 🌌
+
+Great news! Aurora may be visible from your location tonight!
+
+Current Conditions:
+- Kp Index: {kp:.1f}
+- {visibility_info}
+- Your Location: {lat:.2f}°N, {lon:.2f}°W
+- Alert Time: {alert_time}
+
+What to do:
+- 1. Check the attached map to see the aurora forecast.
+- 2. Find a dark location away from city lights.
+- 3. Look north after sunset.
+- 4. Aurora is most active between 10 PM and 2 AM.
+- 5. Be patient - aurora can appear and disappear quickly.
+
+Tips for viewing:
+- Give your eyes 20-30 minutes to adjust to darkness.
+- Use a red flashlight to preserve night vision.
+- Aurora may appear as a green glow or dancing lights.
+- Check weather for clear skies.
+
+The attached map shows current conditions and your location.
+
+Happy aurora hunting!
+
+---
+This alert was generated by your Aurora Monitoring System.
+"""
+
     def __init__(self, user_location, email_config=None):
-        self.user_location = user_location
+        self.user_lat = user_location['lat']
+        self.user_lon = user_location['lon']
         self.kp_threshold = 4
         self.last_alert_time = None
         self.alert_cooldown = 3600  # seconds
         self.email_config = email_config
+        config = email_config or {}
+        self._from = config.get('from_email')
+        self._to = config.get('to_email')
+        self._pwd = config.get('password')
+        self._smtp_host = config.get('smtp_server')
+        self._smtp_port = config.get('smtp_port')
+        self.kp_cache_ttl = 300  # seconds
+        self._kp_cache = None  # (kp_value, timestamp, fetched_at)
+        self.map_cache_ttl = 3 * 3600  # seconds; longer than the 30 minute check interval
+        self._map_cache = {'key': None, 'file': None, 'mtime': 0}
+        self._base_map = None
+        self._out_dir = os.path.abspath('.')  # maps are saved to the working directory
+        self.map_archive_size = 24  # hourly copies
+        self._map_archive = deque(sorted(glob.glob(_ARCHIVE_MAP_PATTERN)))
+        self._smtp_conn = None
+        atexit.register(self._close_smtp)
 
     def get_kp_index(self):
+        # Reuse a recent reading so the check, map and emails of one cycle share a single request
+        if self._kp_cache is not None:
+            kp_value, timestamp, fetched_at = self._kp_cache
+            if time.monotonic() - fetched_at < self.kp_cache_ttl:
+                return kp_value, timestamp
+
         try:
             url = "https://services.swpc.noaa.gov/products/noaa-planetary-k-index.json"
-            response = requests.get(url, timeout=10)
+            response = _SESSION.get(url, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if orjson else response.json()
                 if len(data) > 1:
                     latest_entry = data[-1]
                     kp_value = float(latest_entry[1])
                     timestamp = latest_entry[0]
+                    self._kp_cache = (kp_value, timestamp, time.monotonic())
                     return kp_value, timestamp
             return None, None
         except Exception as e:
@@ -39,44 +266,16 @@ class AuroraSystem:
 
     def format_timestamp(self, timestamp_str):
         """Convert API timestamp to human-readable format"""
-        if timestamp_str is None or timestamp_str == "Unknown":
-            return "Unknown"
-        
-        try:
-            # Parse the timestamp from API (format: "2024-01-15 12:00:00")
-            dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-            return dt.strftime("%Y-%m-%d %I:%M %p UTC")
-        except Exception as e:
-            print(f"Error formatting timestamp: {e}")
-            return timestamp_str  # Return original if fail to parse
+        return _format_timestamp(timestamp_str)
 
     def calculate_aurora_visibility(self, kp_index):
-        visibility_map = {
-            9: 35, 8: 40, 7: 45, 6: 50, 5: 55, 4: 60, 3: 65, 2: 70, 1: 75, 0: 80
-        }
-        user_lat = self.user_location['lat']
-        visible_latitude = 80
-        for kp_level in sorted(visibility_map.keys(), reverse=True):
-            if kp_index >= kp_level:
-                visible_latitude = visibility_map[kp_level]
-                break
-        is_visible = user_lat >= visible_latitude
+        visible_latitude = _KP_TO_LATITUDE[min(9, max(0, int(kp_index)))]
+        is_visible = self.user_lat >= visible_latitude
         status = f"Kp={kp_index:.1f}, Visible south to {visible_latitude}°N"
         return is_visible, status, visible_latitude
 
-    def create_aurora_map(self):
-        kp_index, timestamp = self.get_kp_index()
-        if kp_index is None:
-            kp_index = 0
-            timestamp = "Unknown"
-
-        formatted_timestamp = self.format_timestamp(timestamp)
-        
-        #local time for map generation
-        current_time = datetime.now().strftime("%Y-%m-%d %I:%M %p CST")
-
-        is_visible, visibility_info, visible_latitude = self.calculate_aurora_visibility(kp_index)
-
+    def _build_base_map(self):
+        """Build the parts of the map that do not depend on Kp (tiles, latitude grid, layer control)"""
         #centered on North America
         m = folium.Map(
             location=[55, -100],  #North America
@@ -100,47 +299,16 @@ class AuroraSystem:
             control=True
         ).add_to(m)
 
-        aurora_points = []
-        for lon in range(-180, 181, 5):
-            aurora_points.append([visible_latitude, lon])
-        
-        #aurora visibility line
-        folium.PolyLine(
-            locations=aurora_points,
-            color='green',
-            weight=4,
-            opacity=0.8,
-            popup=f"Aurora Visibility Line (Kp={kp_index:.1f})"
-        ).add_to(m)
-
-        #aurora visibility zone (area where aurora might be visible)
-        aurora_zone = []
-        for lon in range(-180, 181, 10):
-            aurora_zone.append([visible_latitude, lon])
-        for lon in range(180, -181, -10):
-             #North boundary
-            aurora_zone.append([90, lon])
-
-        folium.Polygon(
-            locations=aurora_zone,
-            color='green',
-            weight=2,
-            fill=True,
-            fillColor='green',
-            fillOpacity=0.2,
-            popup=f"Potential Aurora Zone (Kp={kp_index:.1f})"
-        ).add_to(m)
-
-        #latitude reference lines
-        for lat in [30, 40, 50, 60, 70]:
-            lat_line = [[lat, -180], [lat, 180]]
+        #latitude reference lines, grouped so they are added to the map as one layer
+        lat_grid = folium.FeatureGroup(name='Latitude Grid', control=False)
+        for lat, lat_line in zip(_REFERENCE_LATITUDES, _REFERENCE_LINES):
             folium.PolyLine(
                 locations=lat_line,
                 color='gray',
                 weight=1,
                 opacity=0.5,
                 dashArray='5, 5'
-            ).add_to(m)
+            ).add_to(lat_grid)
             
             # latitude labels
             folium.Marker(
@@ -150,21 +318,83 @@ class AuroraSystem:
                     icon_size=(40, 20),
                     icon_anchor=(20, 10)
                 )
-            ).add_to(m)
+            ).add_to(lat_grid)
+        lat_grid.add_to(m)
+
+        folium.LayerControl().add_to(m)
+
+        return m
+
+    def create_aurora_map(self, kp_index=None, timestamp=None):
+        if kp_index is None:
+            kp_index, timestamp = self.get_kp_index()
+        if kp_index is None:
+            kp_index = 0
+            timestamp = "Unknown"
+
+        formatted_timestamp = self.format_timestamp(timestamp)
+        
+        #local time for map generation
+        current_time = datetime.now().strftime("%Y-%m-%d %I:%M %p CST")
+
+        is_visible, visibility_info, visible_latitude = self.calculate_aurora_visibility(kp_index)
+
+        # Reuse the last map while it was rendered from the same reading, so it never contradicts the caller
+        map_key = (timestamp, f"{kp_index:.1f}", visible_latitude)
+        cached = self._map_cache
+        if (cached['key'] == map_key and time.time() - cached['mtime'] < self.map_cache_ttl
+                and os.path.exists(cached['file'])):
+            print(f"Conditions unchanged - reusing map: {cached['file']}")
+            return cached['file']
+
+        # Start from a copy of the prebuilt base map and add only the Kp-dependent layers
+        if self._base_map is None:
+            self._base_map = self._build_base_map()
+        m = copy.deepcopy(self._base_map)
+
+        aurora_points = _latitude_band(visible_latitude, _LINE_LONGITUDES).tolist()
+        
+        #aurora visibility line
+        folium.PolyLine(
+            locations=aurora_points,
+            color='green',
+            weight=4,
+            opacity=0.8,
+            popup=f"Aurora Visibility Line (Kp={kp_index:.1f})"
+        ).add_to(m)
+
+        #aurora visibility zone (area where aurora might be visible), from the visible latitude to the pole
+        aurora_zone = {
+            "type": "Polygon",
+            "coordinates": [[
+                [-180, visible_latitude], [180, visible_latitude], [180, 90], [-180, 90], [-180, visible_latitude]
+            ]]
+        }
+
+        folium.GeoJson(
+            aurora_zone,
+            style_function=lambda feature: {
+                'color': 'green',
+                'weight': 2,
+                'fillColor': 'green',
+                'fillOpacity': 0.2
+            },
+            control=False
+        ).add_child(folium.Popup(f"Potential Aurora Zone (Kp={kp_index:.1f})")).add_to(m)
 
         #user location
         user_color = 'red' if not is_visible else 'orange'
         user_icon = 'home'
         
         folium.Marker(
-            location=[self.user_location['lat'], self.user_location['lon']],
+            location=[self.user_lat, self.user_lon],
             popup=f"""
             <b>Your Location</b><br>
-            Lat: {self.user_location['lat']:.2f}°N<br>
-            Lon: {self.user_location['lon']:.2f}°W<br>
+            Lat: {self.user_lat:.2f}°N<br>
+            Lon: {self.user_lon:.2f}°W<br>
             Aurora Visible: {'Yes' if is_visible else 'No'}<br>
             Kp Index: {kp_index:.1f}<br>
-            Distance to Aurora: {abs(self.user_location['lat'] - visible_latitude):.1f}° south
+            Distance to Aurora: {abs(self.user_lat - visible_latitude):.1f}° south
             """,
             tooltip="Your Location",
             icon=folium.Icon(color=user_color, icon=user_icon)
@@ -188,15 +418,15 @@ class AuroraSystem:
         '''
         m.get_root().html.add_child(folium.Element(legend_html))
 
-        folium.LayerControl().add_to(m)
-
-        # Saving data with timestamp in filename
-        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        map_file = f'aurora_forecast_{timestamp_str}.html'
-        m.save(map_file)
+        # Write to a temporary file and swap it in so readers never see a partial map
+        map_file = _LATEST_MAP_FILE
+        m.save(map_file + '.tmp')
+        os.replace(map_file + '.tmp', map_file)
+        self._archive_map(map_file)
+        self._map_cache = {'key': map_key, 'file': map_file, 'mtime': time.time()}
         
         #for opening in browser
-        webbrowser.open('file://' + os.path.realpath(map_file))
+        webbrowser.open('file://' + os.path.join(self._out_dir, map_file))
         
         print(f"Map saved as: {map_file}")
         print(f"Data timestamp: {formatted_timestamp}")
@@ -205,6 +435,79 @@ class AuroraSystem:
         
         return map_file
 
+    def _archive_map(self, map_file):
+        """Keep an hourly copy of the latest map, deleting the oldest beyond map_archive_size"""
+        archive_file = f"aurora_forecast_{datetime.now().strftime('%Y%m%d_%H')}.html"
+        shutil.copyfile(map_file, archive_file)
+        if not self._map_archive or self._map_archive[-1] != archive_file:
+            self._map_archive.append(archive_file)
+
+        while len(self._map_archive) > self.map_archive_size:
+            try:
+                os.remove(self._map_archive.popleft())
+            except FileNotFoundError:
+                pass
+
+    def _connect_smtp(self):
+        """Open an authenticated SMTP session using the email configuration"""
+        # Time out so a silently dropped idle session raises OSError and _smtp() reconnects
+        server = smtplib.SMTP(self._smtp_host, self._smtp_port, timeout=30)
+        server.starttls()
+        server.login(self._from, self._pwd)
+        return server
+
+    def _smtp(self):
+        """Return the shared SMTP session, reconnecting if the server dropped it"""
+        if self._smtp_conn is not None:
+            try:
+                if self._smtp_conn.noop()[0] == 250:
+                    return self._smtp_conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        self._smtp_conn = self._connect_smtp()
+        return self._smtp_conn
+
+    def _close_smtp(self):
+        """Close the shared SMTP session if one is open"""
+        if self._smtp_conn is not None:
+            try:
+                self._smtp_conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp_conn = None
+
+    def _attach_map(self, msg, map_file):
+        """Attach the map HTML to msg gzip-compressed straight from a memory map of the file"""
+        with open(map_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as data:
+                compressed = gzip.compress(data, compresslevel=6)
+        msg.add_attachment(
+            compressed,
+            maintype='application',
+            subtype='gzip',
+            filename=os.path.basename(map_file) + '.gz'
+        )
+
+    def _send(self, subject, body, attachments=(), server=None):
+        """Build an email with the given map attachments and send it over the shared SMTP session"""
+        msg = EmailMessage()
+        msg['From'] = self._from
+        msg['To'] = self._to
+        msg['Subject'] = subject
+        msg.set_content(body, cte='base64')  # 7-bit clean, like the original MIMEText bodies
+
+        for map_file in attachments:
+            if os.path.exists(map_file):
+                print(f"Attaching map file: {map_file}")
+                self._attach_map(msg, map_file)
+
+        if server is None:
+            print("Connecting to SMTP server...")
+            server = self._smtp()
+        print(f"Sending: {subject}")
+        server.send_message(msg)
+
     def send_daily_report_email(self):
         """Send daily aurora report email at noon"""
         if not self.email_config:
@@ -223,86 +526,29 @@ class AuroraSystem:
         is_visible, visibility_info, visible_latitude = self.calculate_aurora_visibility(kp_index)
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['from_email']
-            msg['To'] = self.email_config['to_email']
-            msg['Subject'] = f"Daily Aurora Report - Kp={kp_index:.1f}"
-            
-            # Generate current map
+            # Start the SMTP handshake in the background while the map is generated
+            print("Connecting to SMTP server...")
+            executor = ThreadPoolExecutor(max_workers=1)
+            server_future = executor.submit(self._smtp)
+            executor.shutdown(wait=False)
+
             print("Generating current aurora map...")
-            map_file = self.create_aurora_map()
-            
+            map_file = self.create_aurora_map(kp_index, timestamp)
             current_time = datetime.now().strftime('%Y-%m-%d %I:%M %p CST')
-            
-            # Email body
-            body = f"""
-DAILY AURORA REPORT 🌌
-
-Your daily aurora conditions update for East Peoria, Illinois:
-
-Current Conditions (as of {current_time}):
-- Kp Index: {kp_index:.1f}
-- {visibility_info}
-- Your Location: {self.user_location['lat']:.2f}°N, {self.user_location['lon']:.2f}°W
-- Data From: {formatted_timestamp}
-
-Aurora Status for Your Location:
-- {'VISIBLE - Aurora may be visible tonight!' if is_visible else 'NOT VISIBLE - Aurora not expected to be visible'}
-
-{'AURORA HUNTING TONIGHT:' if is_visible else 'MONITORING STATUS:'}
-- {'''1. Check the attached map for current conditions.
-- 2. Look for dark skies away from city lights.
-- 3. Best viewing time: 10 PM - 2 AM.
-- 4. Look north for green glow or dancing lights.
-- 5. Be patient - aurora can appear and disappear quickly.''' if is_visible else '''1. Check attached map for current conditions.
-- 2. Aurora threshold for your location: Kp ≥ 4.
-- 3. You'll receive alerts when conditions improve.
-- 4. Keep monitoring for geomagnetic storms.'''}
-
-Weather Reminder:
-- Check local weather for clear skies.
-- Aurora is best viewed on dark, clear nights.
-- Light pollution reduces visibility.
-
-The attached map shows the current aurora forecast and your location.
-
-{'Happy aurora hunting tonight!' if is_visible else 'Keep watching the skies!'}
-
----
-Daily Aurora Report from your Aurora Monitoring System
-Next report: Tomorrow at 12:00 PM CST
-"""
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach the map file
-            if os.path.exists(map_file):
-                print(f"📎 Attaching map file: {map_file}")
-                with open(map_file, "rb") as attachment:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {os.path.basename(map_file)}'
-                    )
-                    msg.attach(part)
-            
-            # Send email
-            print("Connecting to SMTP server...")
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            print("Logging in...")
-            server.login(self.email_config['from_email'], self.email_config['password'])
-            print("Sending daily report...")
-            text = msg.as_string()
-            server.sendmail(self.email_config['from_email'], self.email_config['to_email'], text)
-            server.quit()
+            subject = f"Daily Aurora Report - Kp={kp_index:.1f}"
+            body = (self._DAILY_VISIBLE if is_visible else self._DAILY_HIDDEN).format(
+                current_time=current_time,
+                kp=kp_index,
+                visibility_info=visibility_info,
+                lat=self.user_lat,
+                lon=self.user_lon,
+                data_time=formatted_timestamp
+            )
+            self._send(subject, body, (map_file,), server=server_future.result())
             
             print("DAILY AURORA REPORT SENT SUCCESSFULLY!")
-            print(f"   Sent to: {self.email_config['to_email']}")
-            print(f"   Subject: Daily Aurora Report - Kp={kp_index:.1f}")
+            print(f"   Sent to: {self._to}")
+            print(f"   Subject: {subject}")
             print(f"   Time: {current_time}")
             print(f"   Aurora Status: {'VISIBLE' if is_visible else 'NOT VISIBLE'}")
             
@@ -321,62 +567,19 @@ Next report: Tomorrow at 12:00 PM CST
         print("SENDING STARTUP CONFIRMATION EMAIL...")
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['from_email']
-            msg['To'] = self.email_config['to_email']
-            msg['Subject'] = "Aurora Monitoring System Started"
-            
             startup_time = datetime.now().strftime('%Y-%m-%d %I:%M %p CST')
-            
-            # Email body
-            body = f"""
-AURORA MONITORING SYSTEM STARTED
-
-The Aurora Monitoring System is now active and watching the skies!
-
-System Details:
-- Started: {startup_time}
-- Monitoring Location: East Peoria, Illinois
-- Coordinates: {self.user_location['lat']:.2f}°N, {self.user_location['lon']:.2f}°W
-- Alert Threshold: Kp ≥ {self.kp_threshold}
-- Email Alerts: ENABLED
-
-What happens next:
-- System checks aurora conditions every 30 minutes.
-- Daily reports sent at 12:00 PM CST.
-
-Aurora Alert Conditions:
-- Kp Index must be ≥ {self.kp_threshold}.
-- Aurora must be visible from your latitude ({self.user_location['lat']:.1f}°N).
-- Cooldown period: 1 hour between alerts.
-
-System Status: 🟢 ACTIVE AND MONITORING
-
-This email confirms your Aurora Monitoring System is working correctly and ready to alert you when the northern lights are visible!
-
-
----
-Aurora Monitoring System Startup Confirmation
-System will continue monitoring until stopped.
-"""
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
-            print("Connecting to SMTP server...")
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            print("Logging in...")
-            server.login(self.email_config['from_email'], self.email_config['password'])
-            print("Sending startup confirmation...")
-            text = msg.as_string()
-            server.sendmail(self.email_config['from_email'], self.email_config['to_email'], text)
-            server.quit()
+            subject = "Aurora Monitoring System Started"
+            body = self._STARTUP_BODY.format(
+                startup_time=startup_time,
+                lat=self.user_lat,
+                lon=self.user_lon,
+                kp_threshold=self.kp_threshold
+            )
+            self._send(subject, body)
             
             print("STARTUP CONFIRMATION EMAIL SENT SUCCESSFULLY!")
-            print(f"   Sent to: {self.email_config['to_email']}")
-            print(f"   Subject: Aurora Monitoring System Started")
+            print(f"   Sent to: {self._to}")
+            print(f"   Subject: {subject}")
             print(f"   Time: {startup_time}")
             
             return True
@@ -394,77 +597,23 @@ System will continue monitoring until stopped.
         print("SENDING AURORA ALERT EMAIL...")
         print(f"   Kp Index: {kp_index:.1f}")
         print(f"   Visibility: {visibility_info}")
-        print(f"   From: {self.email_config['from_email']}")
-        print(f"   To: {self.email_config['to_email']}")
+        print(f"   From: {self._from}")
+        print(f"   To: {self._to}")
         
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['from_email']
-            msg['To'] = self.email_config['to_email']
-            msg['Subject'] = f"Aurora Alert! Kp={kp_index:.1f} - Visible from your location!"
-            
             alert_time = datetime.now().strftime('%Y-%m-%d %I:%M %p CST')
-            
-            body = f"""
-AURORA ALERT! 🌌
-
-Great news! Aurora may be visible from your location tonight!
-
-Current Conditions:
-- Kp Index: {kp_index:.1f}
-- {visibility_info}
-- Your Location: {self.user_location['lat']:.2f}°N, {self.user_location['lon']:.2f}°W
-- Alert Time: {alert_time}
-
-What to do:
-- 1. Check the attached map to see the aurora forecast.
-- 2. Find a dark location away from city lights.
-- 3. Look north after sunset.
-- 4. Aurora is most active between 10 PM and 2 AM.
-- 5. Be patient - aurora can appear and disappear quickly.
-
-Tips for viewing:
-- Give your eyes 20-30 minutes to adjust to darkness.
-- Use a red flashlight to preserve night vision.
-- Aurora may appear as a green glow or dancing lights.
-- Check weather for clear skies.
-
-The attached map shows current conditions and your location.
-
-Happy aurora hunting!
-
----
-This alert was generated by your Aurora Monitoring System.
-"""
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach the map file
-            if os.path.exists(map_file):
-                print(f"Attaching map file: {map_file}")
-                with open(map_file, "rb") as attachment:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {os.path.basename(map_file)}'
-                    )
-                    msg.attach(part)
-            
-            # Send email
-            print("Connecting to SMTP server...")
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            print("Logging in...")
-            server.login(self.email_config['from_email'], self.email_config['password'])
-            print("Sending aurora alert...")
-            text = msg.as_string()
-            server.sendmail(self.email_config['from_email'], self.email_config['to_email'], text)
-            server.quit()
+            subject = f"Aurora Alert! Kp={kp_index:.1f} - Visible from your location!"
+            body = self._ALERT_BODY.format(
+                kp=kp_index,
+                visibility_info=visibility_info,
+                lat=self.user_lat,
+                lon=self.user_lon,
+                alert_time=alert_time
+            )
+            self._send(subject, body, (map_file,))
             
             print("AURORA ALERT EMAIL SENT SUCCESSFULLY!")
-            print(f"   Sent to: {self.email_config['to_email']}")
+            print(f"   Sent to: {self._to}")
             print(f"   Subject: Aurora Alert! Kp={kp_index:.1f}")
             print(f"   Time: {alert_time}")
             
@@ -478,7 +627,7 @@ This alert was generated by your Aurora Monitoring System.
         current_time = datetime.now().strftime('%Y-%m-%d %I:%M %p CST')
         print(f"\nAurora Alert! Kp={kp_index:.1f}")
         print(f"Visibility info: {visibility_info}")
-        print(f"Your Location: {self.user_location['lat']:.2f}°N, {self.user_location['lon']:.2f}°W")
+        print(f"Your Location: {self.user_lat:.2f}°N, {self.user_lon:.2f}°W")
         print(f"Generated at: {current_time}\n")
 
     def check_aurora_conditions(self):
@@ -506,7 +655,7 @@ This alert was generated by your Aurora Monitoring System.
             self.last_alert_time = time.time()
             
             print("Generating interactive map...")
-            map_file = self.create_aurora_map()
+            map_file = self.create_aurora_map(kp_index, timestamp)
             
             if self.email_config:
                 self.send_email_alert(kp_index, visibility_info, map_file)
@@ -514,7 +663,7 @@ This alert was generated by your Aurora Monitoring System.
             print(f"No alert needed. Visible: {is_visible}, Kp: {kp_index}")
             # Still generate map for monitoring
             print("Generating interactive map...")
-            self.create_aurora_map()
+            self.create_aurora_map(kp_index, timestamp)
 
     def run_monitoring(self):
         print("STARTING AURORA MONITORING SYSTEM...")
@@ -541,9 +690,14 @@ This alert was generated by your Aurora Monitoring System.
         print("   Interactive maps will open automatically")
         print("\nPress Ctrl+C to stop monitoring...")
         
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        try:
+            while True:
+                schedule.run_pending()
+                # Sleep until the next job is due instead of waking every minute
+                idle_seconds = schedule.idle_seconds()
+                time.sleep(60 if idle_seconds is None else max(idle_seconds, 0))
+        except KeyboardInterrupt:
+            print("\nAURORA MONITORING STOPPED.")
 
     def run_once(self):
         """Run the aurora check just once (useful for testing)"""
@@ -561,6 +715,20 @@ This alert was generated by your Aurora Monitoring System.
         print("TESTING EMAIL CONFIGURATION ONLY...")
         return self.send_startup_email()
 
+def load_email_config():
+    """Read email settings from environment variables; returns None when no sender is configured"""
+    from_email = os.environ.get('AURORA_FROM')
+    password = os.environ.get('AURORA_PASSWORD')
+    if not from_email or not password:
+        return None
+    return {
+        'from_email': from_email,
+        'password': password,
+        'to_email': os.environ.get('AURORA_TO', from_email),
+        'smtp_server': os.environ.get('AURORA_SMTP_SERVER', 'smtp.gmail.com'),
+        'smtp_port': int(os.environ.get('AURORA_SMTP_PORT', 587))
+    }
+
 if __name__ == "__main__":
     # East Peoria, Illinois coordinates
     user_location = {
@@ -568,17 +736,13 @@ if __name__ == "__main__":
         'lon': -89.5890
     }
     
-    # Email configuration - FILL IN YOUR ACTUAL EMAIL DETAILS:
-    email_config = {
-        'from_email': 'adamkul0126@gmail.com',   # ← Replace with your Gmail address
-        'password': 'vllhguaooklsipue',         # ← Replace with your Gmail app password
-        'to_email': 'adamkul0126@gmail.com',     # ← Email address to receive alerts
-        'smtp_server': 'smtp.gmail.com',         # ← Keep this for Gmail
-        'smtp_port': 587                         # ← Keep this for Gmail
-    }
-    
-    # To disable email alerts, uncomment the line below:
-    # email_config = None
+    # Email configuration is read from the environment - set before running:
+    #   AURORA_FROM       Gmail address to send from
+    #   AURORA_PASSWORD   Gmail app password
+    #   AURORA_TO         address to receive alerts (defaults to AURORA_FROM)
+    #   AURORA_SMTP_SERVER / AURORA_SMTP_PORT (default smtp.gmail.com:587)
+    # Email alerts are disabled when AURORA_FROM or AURORA_PASSWORD is unset.
+    email_config = load_email_config()
      
     aurora_system = AuroraSystem(user_location, email_config)
     